@@ -1,6 +1,7 @@
 """Functions for cancelling groups of tests or jobs."""
 
 import io
+import os
 from collections import defaultdict
 from typing import List, TextIO
 import time
@@ -30,35 +31,58 @@ def cancel_jobs(pav_cfg, tests: List[TestRun], errfile: TextIO = None) -> List[d
         if test.job is not None and test.job not in jobs_by_sched[test.scheduler]:
             jobs_by_sched[test.scheduler].append(test.job)
 
+    # Load the tests for every job at once, so they're all loaded in parallel.
+    # A test's working_dir may be a symlinked path (while the job's isn't), so compare
+    # them by their resolved paths.
+    job_pairs = {}
+    all_pairs = []
+    for jobs in jobs_by_sched.values():
+        for job in jobs:
+            job_pairs[job.path] = [(working_dir.resolve(), test_id)
+                                   for working_dir, test_id in job.get_test_id_pairs()]
+            all_pairs.extend(job_pairs[job.path])
+
+    loaded_tests = {(test.working_dir.resolve(), test.id): test
+                    for test in load_tests(pav_cfg, all_pairs, errfile)}
+
     jobs_cancelled = []
     for sched_name, jobs in jobs_by_sched.items():
         sched = schedulers.get_plugin(sched_name)
 
+        # Collect the jobs we can cancel, so they can be cancelled in a single batch.
+        to_cancel = []
         for job in jobs:
-            job_tests = load_tests(pav_cfg, job.get_test_id_pairs(), errfile)
-
-            if all([test.cancelled or test.complete for test in job_tests]):
-                if job.info is None:
-                    msg = "Cancel Failed - No such job"
-                else:
-                    msg = sched.cancel(job.info)
-                success = True if msg is None else False
-                if msg is None:
-                    msg = 'Cancel Succeeded'
+            job_tests = [loaded_tests[pair] for pair in job_pairs[job.path]
+                         if pair in loaded_tests]
+
+            if not all([test.cancelled or test.complete for test in job_tests]):
                 jobs_cancelled.append({
                     'scheduler': sched_name,
                     'job': str(job),
-                    'success': str(success),
-                    'msg': msg,
-                })
-            else:
+                    'success': False,
+                    'msg': "Uncancelled tests still running."})
+            elif job.info is None:
                 jobs_cancelled.append({
                     'scheduler': sched_name,
                     'job': str(job),
-                    'success': False,
-                    'msg': "Uncancelled tests still running."})
+                    'success': str(False),
+                    'msg': "Cancel Failed - No such job"})
+            else:
+                to_cancel.append(job)
+
+        if not to_cancel:
+            continue
 
-        return jobs_cancelled
+        msgs = sched.cancel_jobs([job.info for job in to_cancel])
+        for job, msg in zip(to_cancel, msgs):
+            jobs_cancelled.append({
+                'scheduler': sched_name,
+                'job': str(job),
+                'success': str(msg is None),
+                'msg': 'Cancel Succeeded' if msg is None else msg,
+            })
+
+    return jobs_cancelled
 
 
 SLEEP_PERIOD = 0.3
@@ -127,14 +151,19 @@ def cancel_tests(pav_cfg, tests: List, outfile: TextIO,
     else:
         output.fprint(outfile, "No jobs needed to be cancelled.")
 
+    if no_series_warning:
+        return 0
+
+    warn_after = time.time() - SERIES_WARN_EXPIRE
     for test in tests:
-        series_path = test.path/'series'
-        if not series_path.exists():
+        series_path = os.path.join(test.path.as_posix(), 'series')
+        try:
+            series_mtime = os.stat(series_path).st_mtime
+        except OSError:
             continue
 
-        if not (series_path/'ALL_TESTS_STARTED').exists()  \
-                and (series_path.stat().st_mtime + SERIES_WARN_EXPIRE > time.time()
-                and not no_series_warning):
+        if series_mtime > warn_after \
+                and not os.path.exists(os.path.join(series_path, 'ALL_TESTS_STARTED')):
             output.fprint(outfile, "\nTests cancelled, but associated series "
                                    "may still be running.\n"
                                    "Use `pav series cancel` to cancel the series itself.")
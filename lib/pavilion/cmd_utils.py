@@ -334,30 +334,35 @@ def _filter_tests_by_raw_id(pav_cfg, id_pairs: List[ID_Pair],
                             exclude_ids: List[str]) -> List[ID_Pair]:
     """Filter the given tests by raw id."""
 
-    exclude_pairs = []
+    exclude_pairs = set()
 
-    for raw_id in exclude_ids:
+    for raw_id in exclude_ids or []:
         if '.' in raw_id:
             label, ex_id = raw_id.split('.', 1)
         else:
             label = 'main'
             ex_id = raw_id
 
-        ex_wd = pav_cfg['configs'].get(label, None)
-        if ex_wd is None:
+        ex_config = pav_cfg['configs'].get(label, None)
+        if ex_config is None:
             # Invalid label.
             continue
 
-        ex_wd = Path(ex_wd)
+        ex_wd = Path(ex_config['working_dir']).resolve()
 
         try:
             ex_id = int(ex_id)
         except ValueError:
             continue
 
-        exclude_pairs.append((ex_wd, ex_id))
+        exclude_pairs.add((ex_wd, ex_id))
 
-    return [pair for pair in id_pairs if pair not in exclude_pairs]
+    if not exclude_pairs:
+        return id_pairs
+
+    # The given pairs may not have resolved working dirs (when from parse_raw_id).
+    return [pair for pair in id_pairs
+            if (Path(pair[0]).resolve(), pair[1]) not in exclude_pairs]
 
 
 def get_tests_by_paths(pav_cfg, test_paths: List[Path], errfile: TextIO,
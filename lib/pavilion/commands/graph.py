@@ -16,19 +16,34 @@ from pavilion.result.evaluations import check_evaluations, evaluate_results
 from .base_classes import Command
 from ..errors import ResultError
 
-try:
-    import matplotlib
+# Matplotlib is slow to import. Normally only the command being run is loaded, but
+# a bare 'pav' (or a help call) imports every command module. Deferring the import
+# until we actually graph something keeps those calls from paying for it.
+matplotlib = None  # pylint: disable=invalid-name
 
-    matplotlib.use('agg')
-    import matplotlib.pyplot
 
-    matplotlib.pyplot.ioff()
+def _import_matplotlib() -> bool:
+    """Import matplotlib (and pyplot) into this module on first use.
 
-    HAS_MATPLOTLIB = True
+    :returns: False if matplotlib isn't available.
+    """
+
+    global matplotlib  # pylint: disable=global-statement,invalid-name
+
+    if matplotlib is not None:
+        return True
+
+    try:
+        import matplotlib as _matplotlib  # pylint: disable=import-outside-toplevel
+        _matplotlib.use('agg')
+        import matplotlib.pyplot as _pyplot  # pylint: disable=import-outside-toplevel
+        _pyplot.ioff()
+    except ImportError:
+        return False
+
+    matplotlib = _matplotlib
+    return True
 
-except ImportError:
-    HAS_MATPLOTLIB = False
-    matplotlib = None
 
 DIMENSIONS_RE = re.compile(r'\d+x\d+')
 
@@ -123,7 +138,7 @@ class GraphCommand(Command):
     def run(self, pav_cfg, args):
         """Create a graph."""
 
-        if not HAS_MATPLOTLIB:
+        if not _import_matplotlib():
             output.fprint(self.errfile,
                           "The command requires matplotlib to function. Matplotlib is an "
                           "optional requirement of Pavilion.")
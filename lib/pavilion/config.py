@@ -7,16 +7,33 @@ config or through other options."""
 import getpass
 import grp
 import os
+import pickle
+import re
 import stat
 import sys
+import tempfile
 from collections import OrderedDict
 from pathlib import Path
 from typing import List, Union, Dict, NewType
 
 import yaml_config as yc
+import yc_yaml
 from pavilion import output
 from pavilion import errors
 
+try:
+    # PyYAML's libyaml bindings parse much faster than the pure python yc_yaml parser.
+    # They're optional; we fall back to yc_yaml when they aren't available.
+    import yaml as pyyaml
+
+    _CSafeLoader = pyyaml.CSafeLoader
+
+    HAS_LIBYAML = True
+
+except (ImportError, AttributeError):
+    HAS_LIBYAML = False
+    pyyaml = None
+
 # Figure out what directories we'll search for the base configuration.
 PAV_CONFIG_SEARCH_DIRS = [Path('./').resolve()]
 
@@ -50,6 +67,9 @@ if PAV_CONFIG_DIR is not None:
 # Use this config file, if it exists.
 PAV_CONFIG_FILE = os.environ.get('PAV_CONFIG_FILE', None)
 
+# Where we cache the loaded base config. Set PAV_NO_CFG_CACHE to disable the cache.
+PAV_CFG_CACHE_PATH = USER_HOME_PAV/'.cache'/'pav_cfg.pkl'
+
 DEFAULT_CONFIG_LABEL = 'main'
 
 # For multi-processing, use between 2 and 10 cpu's by default, preferring the
@@ -71,6 +91,44 @@ class PavConfigError(errors.PavilionError):
     """Config specific errors."""
 
 
+if HAS_LIBYAML:
+    class _LibYamlLoader(_CSafeLoader):
+        """A libyaml based loader that, like yc_yaml, rejects duplicate mapping keys."""
+
+        def construct_mapping(self, node, deep=False):
+            """Check for duplicate keys before constructing the mapping."""
+
+            keys = set()
+            for key_node, _ in node.value:
+                if not isinstance(key_node, pyyaml.ScalarNode):
+                    continue
+
+                if key_node.value in keys:
+                    raise pyyaml.constructor.ConstructorError(
+                        "While constructing a mapping", node.start_mark,
+                        "found duplicate key", key_node.start_mark)
+                keys.add(key_node.value)
+
+            return super().construct_mapping(node, deep=deep)
+
+
+def load_yaml(infile):
+    """Load raw yaml data from the given stream, using libyaml when it's available.
+    Parse errors are always raised as yc_yaml errors."""
+
+    if not HAS_LIBYAML:
+        return yc_yaml.load(infile)
+
+    try:
+        return pyyaml.load(infile, Loader=_LibYamlLoader)
+    except pyyaml.MarkedYAMLError as err:
+        raise yc_yaml.MarkedYAMLError(
+            context=err.context, context_mark=err.context_mark,
+            problem=err.problem, problem_mark=err.problem_mark, note=err.note)
+    except pyyaml.YAMLError as err:
+        raise yc_yaml.YAMLError(str(err))
+
+
 class PavConfigDict:
     """The default config dict class is meant for flexibility. We want something that can
     also handle type checking."""
@@ -260,7 +318,12 @@ class ExPathElem(yc.PathElem):
         elif isinstance(path, str):
             path = Path(path)
 
-        path = Path(os.path.expandvars(path.as_posix()))
+        path_str = path.as_posix()
+        # Most paths have nothing to expand.
+        if '$' not in path_str and not path_str.startswith('~'):
+            return path
+
+        path = Path(os.path.expandvars(path_str))
         path = path.expanduser()
         return path
 
@@ -325,6 +388,12 @@ class PavilionConfigLoader(yc.YamlConfigLoader):
 
     type = PavConfig
 
+    @staticmethod
+    def load_raw(infile):
+        """Load the raw config, using libyaml when available."""
+
+        return load_yaml(infile)
+
     # Each and every configuration element needs to either not be required,
     # or have a sensible default. Essentially, Pavilion needs to work if no
     # config is given.
@@ -481,6 +550,12 @@ class LocalConfigLoader(yc.YamlConfigLoader):
 
     type = LocalConfig
 
+    @staticmethod
+    def load_raw(infile):
+        """Load the raw config, using libyaml when available."""
+
+        return load_yaml(infile)
+
     ELEMENTS = [
         yc.RegexElem(
             'label', regex=r'[a-z]+', required=False,
@@ -519,22 +594,37 @@ def add_config_dirs(pav_cfg, setup_working_dirs: bool) -> OrderedDict:
 
     label_i = 1
 
-    if pav_cfg['user_config'] and USER_HOME_PAV and USER_HOME_PAV.exists():
-        config_dirs.append(USER_HOME_PAV.resolve())
-
+    # These don't change while we're processing config directories, so only resolve
+    # them once.
+    user_home = None
+    if USER_HOME_PAV is not None and USER_HOME_PAV.exists():
+        user_home = USER_HOME_PAV.resolve()
+    pav_config_dir = None
     if PAV_CONFIG_DIR is not None and PAV_CONFIG_DIR.exists():
-        for config_dir in config_dirs:
-            try:
-                if PAV_CONFIG_DIR.samefile(config_dir):
-                    break
-            except PermissionError:
-                continue
-        else:
-            config_dirs.append(PAV_CONFIG_DIR)
+        pav_config_dir = PAV_CONFIG_DIR.resolve()
+
+    if pav_cfg['user_config'] and user_home is not None:
+        config_dirs.append(user_home)
+
+    # This is skipped below if it's already one of the config directories.
+    if pav_config_dir is not None:
+        config_dirs.append(pav_config_dir)
 
+    # Labels to use for these special config directories when they don't set their own.
+    default_labels = {}
+    if pav_config_dir is not None:
+        default_labels[pav_config_dir] = DEFAULT_CONFIG_LABEL
+    if user_home is not None:
+        default_labels[user_home] = 'user'
+
+    seen_dirs = set()
     for config_dir in config_dirs:
         try:
             config_dir = config_dir.resolve()
+            if config_dir in seen_dirs:
+                continue
+            seen_dirs.add(config_dir)
+
             if not config_dir.exists():
                 pav_cfg.warnings.append(
                     "Could not add config dir '{}': Directory does not exist."
@@ -552,12 +642,11 @@ def add_config_dirs(pav_cfg, setup_working_dirs: bool) -> OrderedDict:
 
         config_path = config_dir/CONFIG_NAME
         try:
-            if not (config_path.exists() and config_path.is_file()):
-                config = loader.load_empty()
-            else:
-                with config_path.open() as config_file:
-                    config = loader.load(config_file)
-
+            with config_path.open() as config_file:
+                config = loader.load(config_file)
+        except (FileNotFoundError, IsADirectoryError):
+            # A config directory doesn't need a config file.
+            config = loader.load_empty()
         except OSError as err:
             pav_cfg.warnings.append(
                 "Could not read config file {}: {}".format(config_path, err))
@@ -565,22 +654,15 @@ def add_config_dirs(pav_cfg, setup_working_dirs: bool) -> OrderedDict:
 
         label = config.get('label')
         group = config.get('group')
-        config_dir = config_dir.resolve()
 
-        # Set the user's home pavilion directory label to 'user'.
+        # The user's home pavilion directory gets the label 'user', and the
+        # PAV_CONFIG_DIR directory gets 'main'. Other config directories can snatch
+        # 'main' up first though.
         if not label:
-            if (USER_HOME_PAV is not None and USER_HOME_PAV.exists() and
-                    config_dir.samefile(USER_HOME_PAV)):
-                label = 'user'
-            # Set the label to 'main' if the config_dir is the one set by
-            # PAV_CONFIG_DIR. Other config directories can snatch this up first though.
-            elif (PAV_CONFIG_DIR is not None and PAV_CONFIG_DIR.exists() and
-                  config_dir.samefile(PAV_CONFIG_DIR)):
-                if DEFAULT_CONFIG_LABEL not in configs:
-                    label = DEFAULT_CONFIG_LABEL
-                else:
-                    label = '_' + DEFAULT_CONFIG_LABEL
-            elif DEFAULT_CONFIG_LABEL not in configs:
+            label = default_labels.get(config_dir)
+            if label == DEFAULT_CONFIG_LABEL and label in configs:
+                label = '_' + DEFAULT_CONFIG_LABEL
+            elif label is None and DEFAULT_CONFIG_LABEL not in configs:
                 label = DEFAULT_CONFIG_LABEL
 
         if label in configs or not label:
@@ -589,7 +671,7 @@ def add_config_dirs(pav_cfg, setup_working_dirs: bool) -> OrderedDict:
             label_i += 1
             pav_cfg.warnings.append(
                 "Missing or duplicate label '{}' for config path '{}'. "
-                "Using label '{}'".format(label, config_path.as_posix(), new_label))
+                "Using label '{}'".format(label, config_path, new_label))
             config['label'] = new_label
 
         working_dir = config.get('working_dir')  # type: Path
@@ -625,6 +707,67 @@ def add_config_dirs(pav_cfg, setup_working_dirs: bool) -> OrderedDict:
     return configs
 
 
+# Matches environment variable references, just like os.path.expandvars.
+ENV_VAR_RE = re.compile(r'\$(\w+|\{[^}]*\})')
+
+
+def _pav_cfg_cache_key(path: Path, cfg_file) -> tuple:
+    """Generate a key that captures everything that determines how the given
+    (open) config file loads. This includes the file's size and mtime, this
+    module, and the values of any environment variables the file references."""
+
+    cfg_stat = os.fstat(cfg_file.fileno())
+    env_vars = sorted(set(var.strip('{}') for var in ENV_VAR_RE.findall(cfg_file.read())))
+
+    return (path.as_posix(), cfg_stat.st_mtime_ns, cfg_stat.st_size,
+            os.stat(__file__).st_mtime_ns, PAV_ROOT.as_posix(), NCPU,
+            os.environ.get('HOME'),
+            tuple((var, os.environ.get(var)) for var in env_vars))
+
+
+def load_pav_config(path: Path, cache_path: Path = None) -> PavConfig:
+    """Load the Pavilion config at the given path. When a cache path is given, a
+    still valid cached copy of the config is used if one exists. Otherwise the
+    freshly loaded config is saved there (as long as its directory's parent exists).
+
+    :raises OSError: When the config file can't be read.
+    :raises Exception: Any of the errors raised when loading a YamlConfig file.
+    """
+
+    cache_key = None
+
+    with path.open() as cfg_file:
+        if cache_path is not None:
+            cache_key = _pav_cfg_cache_key(path, cfg_file)
+
+            try:
+                with cache_path.open('rb') as cache_file:
+                    cached_key, cached_cfg = pickle.load(cache_file)
+                if cached_key == cache_key:
+                    return cached_cfg
+            except Exception:  # pylint: disable=broad-except
+                # Any problem with the cache just means we have to load the config.
+                pass
+
+            cfg_file.seek(0)
+
+        pav_cfg = PavilionConfigLoader().load(cfg_file)
+
+    if cache_key is not None and cache_path.parent.parent.exists():
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            tmp_path = Path(tempfile.mktemp(suffix='.tmp', dir=cache_path.parent.as_posix()))
+            with tmp_path.open('wb') as tmp_file:
+                pickle.dump((cache_key, pav_cfg), tmp_file)
+            tmp_path.rename(cache_path)
+        except (OSError, pickle.PicklingError):
+            if tmp_path is not None and tmp_path.exists():
+                tmp_path.unlink()
+
+    return pav_cfg
+
+
 def find_pavilion_config(target: Path = None, setup_working_dirs=True) -> PavConfig:
     """Search for a pavilion.yaml configuration file. Use the one pointed
 to by the PAV_CONFIG_FILE environment variable. Otherwise, use the first
@@ -642,34 +785,37 @@ found in these directories the default config search paths:
 
     pav_cfg: Union[PavConfig, None] = None
 
+    cache_path = None if os.environ.get('PAV_NO_CFG_CACHE') else PAV_CFG_CACHE_PATH
+
     for path in target, PAV_CONFIG_FILE:
         if path is None:
             continue
 
         pav_cfg_file = Path(path)
-        # pylint has a bug that pops up occasionally with pathlib.
-        if pav_cfg_file.is_file():  # pylint: disable=no-member
-            try:
-                pav_cfg = PavilionConfigLoader().load(
-                    pav_cfg_file.open())  # pylint: disable=no-member
-                pav_cfg.pav_cfg_file = pav_cfg_file
-            except Exception as err:
-                raise RuntimeError("Error in Pavilion config at {}: {}"
-                                   .format(pav_cfg_file, err))
+        try:
+            # Don't cache the target config; it's only used (and changed often) in testing.
+            pav_cfg = load_pav_config(pav_cfg_file,
+                                      cache_path if path is not target else None)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            continue
+        except Exception as err:
+            raise RuntimeError("Error in Pavilion config at {}: {}"
+                               .format(pav_cfg_file, err))
+        pav_cfg.pav_cfg_file = pav_cfg_file
 
     if pav_cfg is None:
         for config_dir in PAV_CONFIG_SEARCH_DIRS:
             path = config_dir/PAV_CONFIG_NAME
-            if path.is_file():  # pylint: disable=no-member
-                try:
-                    # Parse and load the configuration.
-                    pav_cfg = PavilionConfigLoader().load(
-                        path.open())  # pylint: disable=no-member
-                    pav_cfg.pav_cfg_file = path
-                    break
-                except Exception as err:
-                    raise PavConfigError("Error in Pavilion config at {}"
-                                         .format(path), err)
+            # Just try to open the config; a missing file costs no more than checking first.
+            try:
+                pav_cfg = load_pav_config(path, cache_path)
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                continue
+            except Exception as err:
+                raise PavConfigError("Error in Pavilion config at {}"
+                                     .format(path), err)
+            pav_cfg.pav_cfg_file = path
+            break
 
     if pav_cfg is None:
         pav_cfg = PavilionConfigLoader().load_empty()
@@ -3,7 +3,6 @@ essentially serves as a filesystem primary key."""
 
 import json
 import logging
-import math
 import os
 import pickle
 import shutil
@@ -13,7 +12,7 @@ from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
 from typing import Callable, List, Iterable, Any, Dict, NewType, \
-    Union, NamedTuple, IO, Tuple
+    Union, NamedTuple, IO
 
 from pavilion import lockfile
 from pavilion import output
@@ -173,22 +172,29 @@ def index(pav_cfg,
     if idx and time.time() - idx_mtime <= refresh_period:
         return idx
 
-    files = [file.path for file in os.scandir(id_dir.as_posix())]
-
-    def make_int_ids(paths: List[Path]) -> List[Tuple[int, Path]]:
-        """Convert an filename to an integer if we can."""
-
-        id_results = []
-
-        for id_path in paths:
-            id_path = Path(id_path)
+    # Only directories can be id directories. The dir entries usually know their type
+    # already, so this doesn't need a stat per entry. Ids are parsed straight from the
+    # entry names, and we only make paths for the entries that need an index update.
+    all_seen_ids = set()
+    update_id_pairs = []
+    with os.scandir(id_dir.as_posix()) as entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
 
             try:
-                id_results.append((int(id_path.name, fn_base), id_path))
+                id_ = int(entry.name, fn_base)
             except ValueError:
-                pass
+                continue
 
-        return id_results
+            all_seen_ids.add(id_)
+
+            if id_ in idx and idx[id_].get(complete_key, False):
+                continue
+            update_id_pairs.append((id_, Path(entry.path)))
+
+    # Any indexed ids we didn't see no longer exist.
+    missing = set(idx.keys()) - all_seen_ids
 
     def do_transform(pair):
         """Do the transform on the id and file pair."""
@@ -202,28 +208,6 @@ def index(pav_cfg,
 
     thread_max = pav_cfg.get('max_threads')
     with ThreadPoolExecutor(max_workers=thread_max) as pool:
-        # This sequence leaves us with a list of id, path pairs that need an index
-        # update.
-        chunk_size = int(math.ceil(len(files)/float(thread_max)))
-        chunks = [files[i*chunk_size:(i+1)*chunk_size] for i in range(thread_max)]
-
-        id_pairs = pool.map(make_int_ids, chunks)
-        # Grab the set of all ids. We'll use it to identify missing ids.
-        all_seen_ids = set()
-        update_id_pairs = []
-        for chunked_results in id_pairs:
-            for id_, path in chunked_results:
-                if id_ is None:
-                    continue
-
-                all_seen_ids.add(id_)
-
-                if id_ in idx and idx[id_].get(complete_key, False):
-                    continue
-                update_id_pairs.append((id_, path))
-
-        missing = set(idx.keys()) - all_seen_ids
-
         transformed_data = pool.map(do_transform, update_id_pairs)
 
     for id_, data in transformed_data:
@@ -837,3 +837,35 @@ class Slurm(SchedulerPluginAdvanced):
         else:
             return "Tried (but failed) to cancel job {}: {}".format(job_info['id'],
                                                                     stderr)
+
+    # Matches the job id in scancel errors like:
+    #   scancel: error: Kill job error on job id 1234: Invalid job id specified
+    SCANCEL_ERR_ID_RE = re.compile(r'job id ([0-9_+.]+)')
+
+    def cancel_jobs(self, job_infos: List[JobInfo]) -> List[Union[str, None]]:
+        """Scancel all the given jobs (that were started on this cluster) with a single
+        command. Only the jobs scancel reported errors for are retried individually
+        (to get per-job error messages). If we can't tell which jobs failed, they
+        are all retried individually."""
+
+        sys_name = sys_vars.get_vars(True)['sys_name']
+        local_ids = [job_info['id'] for job_info in job_infos
+                     if job_info['sys_name'] == sys_name]
+
+        if len(local_ids) > 1:
+            proc = subprocess.Popen(['scancel'] + local_ids,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE)
+            _, stderr = proc.communicate()
+
+            failed_ids = set()
+            if proc.poll() != 0:
+                stderr = stderr.decode('utf8', errors='replace')
+                failed_ids = set(self.SCANCEL_ERR_ID_RE.findall(stderr))
+
+            if proc.poll() == 0 or failed_ids:
+                return [None if job_info['sys_name'] == sys_name
+                        and job_info['id'] not in failed_ids
+                        else self.cancel(job_info) for job_info in job_infos]
+
+        return super().cancel_jobs(job_infos)
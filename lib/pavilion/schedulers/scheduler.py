@@ -169,6 +169,16 @@ class SchedulerPlugin(IPlugin.IPlugin):
 
         raise NotImplementedError("Must be implemented in the plugin class.")
 
+    def cancel_jobs(self, job_infos: List[JobInfo]) -> List[Union[str, None]]:
+        """Cancel each of the given jobs. Schedulers that can cancel multiple jobs
+        with a single command should override this to do so.
+
+        :returns: A list of cancel results (as per ``cancel()``), in the same order as
+            the given job infos.
+        """
+
+        return [self.cancel(job_info) for job_info in job_infos]
+
     def _get_alloc_nodes(self, job: Job) -> NodeList:
         """Given that this is running on an allocation, return the allocation's
         node list.
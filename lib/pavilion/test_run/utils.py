@@ -55,12 +55,15 @@ def load_tests(pav_cfg, id_pairs: List[ID_Pair], errfile: TextIO) -> List['TestR
 
     tests = []
 
-    # Only load tests that haven't already been loaded.
+    # Only load tests that haven't already been loaded. The set is just for fast
+    # duplicate checks; the list keeps the original order.
     not_loaded = []
+    seen = set()
     for pair in id_pairs:
         if pair in LOADED_TESTS:
             tests.append(LOADED_TESTS[pair])
-        elif pair not in not_loaded:
+        elif pair not in seen:
+            seen.add(pair)
             not_loaded.append(pair)
 
     id_filtered_pairs = not_loaded
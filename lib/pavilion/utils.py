@@ -5,7 +5,9 @@ plugins.
 """
 
 import datetime as dt
+import functools
 import os
+import pwd
 import re
 import shutil
 import subprocess
@@ -74,19 +76,23 @@ def dir_contains(file, directory, symlink_ok: bool = False):
     return False
 
 
-def owner(path: Path) -> str:
-    """Safely get the owner of a file, even if that user isn't known."""
+@functools.lru_cache(maxsize=None)
+def _uid_to_name(uid: int) -> str:
+    """Get the user name for the given uid. These are cached, as each lookup may
+    have to go out to LDAP or the like."""
 
     try:
-        return path.owner()
+        return pwd.getpwuid(uid).pw_name
     except KeyError:
-        try:
-            uid = path.stat().st_uid
-        except OSError:
-            uid = 'no_uid'
         return "<unknown user '{}'>".format(uid)
 
 
+def owner(path: Path) -> str:
+    """Safely get the owner of a file, even if that user isn't known."""
+
+    return _uid_to_name(path.stat().st_uid)
+
+
 def make_umask_filtered_copystat(umask: int):
     """Create a 'copystat' function that first applies a umask to any permissions."""
 
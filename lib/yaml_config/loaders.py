@@ -63,7 +63,7 @@ class YamlConfigLoaderMixin:
         :raises ValueError, RequiredError, KeyError: As per validate().
         """
 
-        raw_data = yaml.load(infile)
+        raw_data = self.load_raw(infile)
 
         values = self.normalize(raw_data)
 
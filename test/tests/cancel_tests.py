@@ -1,4 +1,7 @@
+import shutil
+import tempfile
 import time
+from pathlib import Path
 
 from pavilion import cancel_utils
 from pavilion import schedulers
@@ -46,3 +49,71 @@ class CancelTests(unittest.PavTestCase):
 
         # Big note - the dummy scheduler doesn't actually know how to cancel jobs.
         #   That's ok though, since it will tell cancel_job what it wants to here.
+
+    def test_cancel_jobs_symlinked_working_dir(self):
+        """Jobs with running tests shouldn't be cancelled when the working directory
+        is given through a symlink."""
+
+        link_dir = Path(tempfile.mkdtemp())
+        try:
+            wd_link = link_dir/'working_dir'
+            wd_link.symlink_to(self.pav_cfg.working_dir)
+            self.pav_cfg.working_dir = wd_link
+
+            test_cfg = self._quick_test_cfg()
+            test_cfg['run']['cmds'] = ['sleep 5']
+            test_cfg['scheduler'] = 'dummy'
+            test_cfg['schedule'] = {'nodes': 'all'}
+            test1 = self._quick_test(test_cfg, finalize=False)
+            test2 = self._quick_test(test_cfg, finalize=False)
+
+            sched = schedulers.get_plugin(test1.scheduler)
+            sched.schedule_tests(self.pav_cfg, [test1, test2])
+            time.sleep(0.5)
+
+            test1.cancel("For fun")
+
+            while not test1.complete:
+                time.sleep(0.1)
+
+            while not test2.status.has_state(STATES.RUNNING):
+                time.sleep(0.1)
+
+            jobs = cancel_utils.cancel_jobs(self.pav_cfg, [test1, test2])
+            self.assertFalse(jobs[0]['success'])
+            self.assertEqual(jobs[0]['msg'], "Uncancelled tests still running.")
+
+            test2.cancel('for other reasons')
+        finally:
+            shutil.rmtree(link_dir.as_posix())
+
+    def test_cancel_jobs_order(self):
+        """The default cancel_jobs() should return results in job info order."""
+
+        sched = schedulers.get_plugin('dummy')
+        job_infos = [{'id': '2'}, {'id': '1'}, {'id': '3'}, {'id': '1'}]
+
+        self.assertEqual(sched.cancel_jobs(job_infos),
+                         ["I have failed.", None, "I have failed.", None])
+
+    def test_cancel_jobs_multi_sched(self):
+        """Jobs under every scheduler should get cancelled, not just the first."""
+
+        tests = []
+        for sched_name in 'dummy', 'raw':
+            test_cfg = self._quick_test_cfg()
+            test_cfg['run']['cmds'] = ['sleep 5']
+            test_cfg['scheduler'] = sched_name
+            test = self._quick_test(test_cfg, finalize=False)
+            schedulers.get_plugin(sched_name).schedule_tests(self.pav_cfg, [test])
+            tests.append(test)
+
+        for test in tests:
+            test.cancel("For fun")
+
+        for test in tests:
+            while not test.complete:
+                time.sleep(0.1)
+
+        jobs = cancel_utils.cancel_jobs(self.pav_cfg, tests)
+        self.assertEqual(sorted(job['scheduler'] for job in jobs), ['dummy', 'raw'])
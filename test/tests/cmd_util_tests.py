@@ -3,6 +3,7 @@
 import io
 import json
 import shutil
+import tempfile
 from pathlib import Path
 
 from pavilion import dir_db
@@ -59,4 +60,41 @@ class CmdUtilsTests(unittest.PavTestCase):
 
             self.assertEqual(len(cmd_utils.arg_filtered_tests(self.pav_cfg, args).paths), count)
 
+    def test_get_tests_by_paths_exclude(self):
+        """Check that excluded raw ids are filtered out when loading by path."""
+
+        tests = [self._quick_test() for _ in range(3)]
+        paths = [test.path for test in tests]
+
+        label = tests[0].cfg_label
+        loaded = cmd_utils.get_tests_by_paths(self.pav_cfg, paths, io.StringIO(),
+                                              exclude_ids=['{}.{}'.format(label, tests[0].id),
+                                                           '{}.{}'.format(label, tests[1].id),
+                                                           'bad_label.1', 'foo'])
+        self.assertEqual([test.id for test in loaded], [tests[2].id])
+
+        loaded = cmd_utils.get_tests_by_paths(self.pav_cfg, paths, io.StringIO(),
+                                              exclude_ids=None)
+        self.assertEqual(len(loaded), 3)
+
+    def test_get_tests_by_id_exclude(self):
+        """Check that excluded raw ids are filtered out when loading by id, even when
+        the working dir is given through a symlink."""
+
+        tests = [self._quick_test() for _ in range(3)]
+        label = tests[0].cfg_label
+        raw_ids = ['{}.{}'.format(label, test.id) for test in tests]
+
+        link_dir = Path(tempfile.mkdtemp())
+        try:
+            wd_link = link_dir/'working_dir'
+            wd_link.symlink_to(self.pav_cfg['configs'][label]['working_dir'])
+            self.pav_cfg['configs'][label]['working_dir'] = wd_link
+
+            loaded = cmd_utils.get_tests_by_id(self.pav_cfg, raw_ids, io.StringIO(),
+                                               exclude_ids=raw_ids[:2] + ['bad_label.1'])
+            self.assertEqual([test.id for test in loaded], [tests[2].id])
+        finally:
+            shutil.rmtree(link_dir.as_posix())
+
     # TODO: We really need to add unit tests for each of the cmd utils functions.
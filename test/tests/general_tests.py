@@ -1,71 +1,148 @@
+import functools
 import grp
 import stat
 import os
 import shutil
 import subprocess as sp
+import unittest
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List
 
 import yc_yaml as yaml
+from pavilion import config
 from pavilion.test_run import TestRun
-from pavilion import utils
 from pavilion.unittest import PavTestCase
 
+try:
+    # Use libyaml to write our test pavilion.yaml, when available.
+    import yaml as pyyaml
+    CSafeDumper = pyyaml.CSafeDumper
+except (ImportError, AttributeError):
+    pyyaml = None
+    CSafeDumper = None
+
+
+@functools.lru_cache(maxsize=256)
+def _gid_name(gid: int) -> str:
+    """Get the group name for the given gid. Group names won't change during
+    the tests, and looking them up can be slow."""
+
+    return grp.getgrgid(gid).gr_name
+
+
+def _load_legacy_run(pav_cfg, legacy_path: Path, wdir: Path, run: str) -> TestRun:
+    """Copy the given legacy run into the working directory, and load it."""
+
+    run_path = legacy_path/run
+    dst_path = wdir/'test_runs'/run
+
+    shutil.copytree(run_path.as_posix(), dst_path.as_posix(), symlinks=True)
+
+    run_id = 'test.{}'.format(run)
+
+    # Move the build directory into place
+    build_dst = Path(os.readlink((run_path/'build_origin').as_posix()))
+    build_dst = dst_path/build_dst
+    (dst_path/'build_dir').rename(build_dst)
+
+    return TestRun.load_from_raw_id(pav_cfg, run_id)
+
 
 class GeneralTests(PavTestCase):
     """Tests that apply to the whole of Pavilion, rather than some particular
     part."""
 
-    def __init__(self, *args, **kwargs):
+    # The (orig_group, alt_group, alt_group2) to use for these tests. Group lookups
+    # can be slow (with LDAP, for instance), so only do this once for all the tests.
+    _groups = None
+
+    umask = 0o007
+    working_dir = PavTestCase.PAV_ROOT_DIR/'test'/'working_dir'/'wd_perms'
+    config_dir = PavTestCase.TEST_DATA_ROOT/'configs-permissions'
+
+    @classmethod
+    def setUpClass(cls):
+        """Skip these tests entirely if the user doesn't have the groups they need,
+        and write the pavilion.yaml they all share."""
+
+        super().setUpClass()
+
+        if cls._groups is None:
+            cls._groups = cls._find_groups()
 
-        super().__init__(*args, **kwargs)
+        if cls._groups[1] is None:
+            raise unittest.SkipTest(
+                "Your user must be in at least two groups (other than the user's "
+                "group) to run these tests.")
+
+        cls._write_pav_cfg(cls._groups[1])
+
+    @staticmethod
+    def _find_groups():
+        """Find two groups that aren't the user's default group (or sudo), and
+        use those as our alternate groups. The process's supplementary groups are
+        exactly the user's groups, so there's no need to search every group.
+
+        :returns: A tuple of the default group name and the two alternate group
+            structs, or all None if the user doesn't have enough groups.
+        """
 
-        # Find a group that isn't the user's default group (or sudo), and
-        # use that as our default group.
-        login = utils.get_login()
         def_gid = os.getgid()
-        candidates = [group for group in grp.getgrall() if
-                      (login in group.gr_mem
-                       and def_gid != group.gr_gid)]
-
-        if not candidates:
-            self.orig_group = None
-            self.alt_group = None
-            self.alt_group2 = None
-        else:
-            self.orig_group = grp.getgrgid(def_gid).gr_name
-            self.alt_group = candidates[0]  # type: grp.struct_group
-            self.alt_group2 = candidates[1]  # type: grp.struct_group
+        candidates = []
+        for gid in os.getgroups():
+            if gid == def_gid:
+                continue
 
-        self.umask = 0o007
+            try:
+                candidates.append(grp.getgrgid(gid))
+            except KeyError:
+                continue
 
-    def set_up(self) -> None:
-        """Setup the special pav config for these tests."""
+            if len(candidates) == 2:
+                return grp.getgrgid(def_gid).gr_name, candidates[0], candidates[1]
 
-        with self.PAV_CONFIG_PATH.open() as pav_cfg_file:
-            raw_cfg = yaml.load(pav_cfg_file)
+        return None, None, None
 
-        if raw_cfg is None:
-            raw_cfg = {}
+    def set_up(self) -> None:
+        """Give each test a fresh working directory."""
 
-        self.working_dir = self.PAV_ROOT_DIR/'test'/'working_dir'/'wd_perms'
+        self.orig_group, self.alt_group, self.alt_group2 = self._groups
 
         if self.working_dir.exists():
             shutil.rmtree(self.working_dir.as_posix())
 
         self.working_dir.mkdir()
 
-        if self.alt_group is None:
-            self.fail("Your user must be in at least two groups (other than "
-                      "the user's group) to run this test.")
+    @classmethod
+    def _write_pav_cfg(cls, alt_group: grp.struct_group):
+        """Write the pavilion.yaml for these tests, based on the default test config.
+        The file is left alone if it's already what we need, so pav doesn't see a
+        new config file each time the tests are run."""
 
-        raw_cfg['shared_group'] = self.alt_group.gr_name
-        raw_cfg['umask'] = self.umask
-        raw_cfg['working_dir'] = self.working_dir.as_posix()
+        with cls.PAV_CONFIG_PATH.open() as pav_cfg_file:
+            raw_cfg = config.load_yaml(pav_cfg_file)
 
-        self.config_dir = self.TEST_DATA_ROOT/'configs-permissions'
-        with (self.config_dir/'pavilion.yaml').open('w') as pav_cfg_file:
-            yaml.dump(raw_cfg, stream=pav_cfg_file)
+        if raw_cfg is None:
+            raw_cfg = {}
+
+        raw_cfg['shared_group'] = alt_group.gr_name
+        raw_cfg['umask'] = cls.umask
+        raw_cfg['working_dir'] = cls.working_dir.as_posix()
+
+        if CSafeDumper is not None:
+            cfg_text = pyyaml.dump(raw_cfg, Dumper=CSafeDumper)
+        else:
+            cfg_text = yaml.dump(raw_cfg)
+
+        cfg_path = cls.config_dir/'pavilion.yaml'
+        try:
+            if cfg_path.read_text() == cfg_text:
+                return
+        except OSError:
+            pass
+
+        cfg_path.write_text(cfg_text)
 
     def tear_down(self):
         pass
@@ -84,8 +161,8 @@ class GeneralTests(PavTestCase):
 
         self.run_test_cmd(cmd)
 
-        builds = [p for p in (self.working_dir/'builds').iterdir()
-                  if p.is_dir()]
+        with os.scandir((self.working_dir/'builds').as_posix()) as entries:
+            builds = [Path(entry.path) for entry in entries if entry.is_dir()]
         self.check_permissions(self.working_dir, self.alt_group, self.umask,
                                exclude=builds)
         for build in builds:
@@ -97,10 +174,11 @@ class GeneralTests(PavTestCase):
         env = os.environ.copy()
         env['PAV_CONFIG_DIR'] = self.config_dir.as_posix()
 
-        proc = sp.Popen(cmd, env=env, stdout=sp.PIPE, stderr=sp.STDOUT)
-        if (proc.wait(3) != 0) == run_succeeds:
-            out = proc.stdout.read().decode()
-            self.fail("Error running command.\n{}".format(out))
+        # Drain the output while waiting, so a chatty command can't fill the pipe
+        # and block.
+        result = sp.run(cmd, env=env, stdout=sp.PIPE, stderr=sp.STDOUT, timeout=3)
+        if (result.returncode != 0) == run_succeeds:
+            self.fail("Error running command.\n{}".format(result.stdout.decode()))
         self.wait_tests(self.working_dir)
 
     def test_legacy_runs(self):
@@ -110,70 +188,62 @@ class GeneralTests(PavTestCase):
         runs_path = legacy_path/'runs.txt'
         wdir = self.pav_cfg.working_dir
 
-        runs = []
-        with runs_path.open() as runs_file:
-            for line in runs_file:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    runs.append(line)
-
-        for run in runs:
-            run_path = legacy_path/run
-            dst_path = wdir/'test_runs'/run
-            shutil.copytree(run_path.as_posix(), dst_path.as_posix(),
-                            symlinks=True)
-
-            run_id = 'test.{}'.format(run)
+        lines = [line.strip() for line in runs_path.read_text().splitlines()]
+        runs = [line for line in lines if line and not line.startswith('#')]
 
-            # Move the build directory into place
-            build_dst = Path(os.readlink((run_path/'build_origin').as_posix()))
-            build_dst = dst_path/build_dst
-            (dst_path/'build_dir').rename(build_dst)
+        # Copy and load each legacy run in parallel, and then check them here.
+        with ThreadPoolExecutor(max_workers=self.pav_cfg['max_threads']) as pool:
+            futures = [pool.submit(_load_legacy_run, self.pav_cfg, legacy_path, wdir, run)
+                       for run in runs]
 
-            test = TestRun.load_from_raw_id(self.pav_cfg, run_id)
-            self.assertTrue(test.results)
-            self.assertTrue(test.complete)
+            for future in as_completed(futures):
+                test = future.result()
+                self.assertTrue(test.results)
+                self.assertTrue(test.complete)
 
     def check_permissions(self, path: Path, group: grp.struct_group,
                           umask: int, exclude: List[Path] = None):
         """Perform a run and make sure they have correct permissions."""
 
-        if exclude is None:
-            exclude = []
-        else:
-            exclude = [ex_path for ex_path in exclude]
+        exclude = {ex_path.as_posix() for ex_path in exclude or []}
 
         dir_umask = umask & ~0o222
 
-        for file in utils.flat_walk(path):
-            excluded = False
-            for parent in file.parents:
-                if parent in exclude:
-                    excluded = True
-
-            if excluded:
-                continue
-
-            fstat = file.stat()
+        # Gather the stat info for everything first, listing each directory just once.
+        # The entries from each listing know their own type, and cache their stat
+        # results. Plain strings are all we need for the paths.
+        files = []
+        directories = [path.as_posix()]
+        while directories:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    fstat = entry.stat()
+                    lstat = entry.stat(follow_symlinks=False) if entry.is_symlink() else None
+                    files.append((entry.path, entry.name, fstat, lstat))
+
+                    # Excluded directories are checked themselves, but not their
+                    # contents. Symlinked directories aren't followed.
+                    if entry.is_dir(follow_symlinks=False) and entry.path not in exclude:
+                        directories.append(entry.path)
+
+        for file, name, fstat, lstat in files:
             # Make sure all files have the right group.
-            grp_name = grp.getgrgid(fstat.st_gid).gr_name
             self.assertEqual(
                 fstat.st_gid, group.gr_gid,
                 msg="File {} had the incorrect group. Expected {}, got {}"
-                    .format(file, self.alt_group.gr_name, grp_name))
+                    .format(file, self.alt_group.gr_name, _gid_name(fstat.st_gid)))
 
             mode = fstat.st_mode
 
-            if file.is_symlink():
-                mode = file.lstat().st_mode
+            if lstat is not None:
+                mode = lstat.st_mode
                 self.assertEqual(
                     mode, 0o120777,
                     msg="Expected symlink {} to have permissions {} but "
                         "got {}".format(file, stat.filemode(0o120777),
                                         stat.filemode(mode)))
-            elif (file.name.startswith('binfile') or
-                  file.name in ('kickoff', 'build.sh', 'run.sh',
-                                'run.tmpl')):
+            elif (name.startswith('binfile') or
+                  name in ('kickoff', 'build.sh', 'run.sh', 'run.tmpl')):
                 expected = (~umask) & 0o100775
                 # Binfiles should have owner/group execute.
                 self.assertEqual(
@@ -181,7 +251,7 @@ class GeneralTests(PavTestCase):
                     msg="Expected {} to have perms {}, but had {}"
                         .format(file, stat.filemode(expected),
                                 stat.filemode(mode)))
-            elif file.is_file():
+            elif stat.S_ISREG(mode):
                 expected = (~umask) & 0o100664
                 self.assertEqual(
                     oct(mode), oct(expected),
@@ -189,7 +259,7 @@ class GeneralTests(PavTestCase):
                         "but got {}"
                         .format(file, stat.filemode(expected),
                                 stat.filemode(mode)))
-            elif file.is_dir():
+            elif stat.S_ISDIR(mode):
                 expected = 0o40775 & (~dir_umask)
                 self.assertEqual(
                     mode, expected,
@@ -1,7 +1,10 @@
 import io
 import os
+import shutil
+import tempfile
 from pathlib import Path
 
+import yc_yaml
 from pavilion import config
 from pavilion.unittest import PavTestCase
 
@@ -36,6 +39,68 @@ class PavConfigTests(PavTestCase):
 
         self.assertEqual(pav_cfg, new_cfg)
 
+    def test_load_yaml(self):
+        """Make sure the libyaml based loader (if available) matches yc_yaml."""
+
+        loader = config.PavilionConfigLoader()
+        file = io.StringIO()
+        loader.dump(file, loader.load_empty())
+
+        raw_cfgs = [
+            file.getvalue(),
+            "working_dir: /tmp/wd\numask: 007\nproxies: {http: foo}\n"
+            "no_proxy:\n  - a.org\n  - b.org\n",
+        ]
+
+        for raw_cfg in raw_cfgs:
+            self.assertEqual(config.load_yaml(io.StringIO(raw_cfg)),
+                             yc_yaml.load(io.StringIO(raw_cfg)))
+
+        for bad_cfg in "umask: 2\numask: 7\n", "proxies: [foo\n":
+            with self.assertRaises(yc_yaml.YAMLError):
+                config.load_yaml(io.StringIO(bad_cfg))
+
+    def test_config_cache(self):
+        """Make sure loaded configs are cached, and that the cache is invalidated."""
+
+        cfg_path = Path(tempfile.mktemp(suffix='.yaml'))
+        cache_path = Path(tempfile.mkdtemp())/'.cache'/'pav_cfg.pkl'
+
+        try:
+            cfg_path.write_text('umask: "007"\nworking_dir: /tmp/$USER/wd\n')
+            pav_cfg = config.load_pav_config(cfg_path, cache_path)
+            self.assertTrue(cache_path.exists())
+            self.assertEqual(config.load_pav_config(cfg_path, cache_path), pav_cfg)
+
+            # Changing the file should invalidate the cache.
+            cfg_path.write_text('umask: "0077"\nworking_dir: /tmp/$USER/wd\n')
+            self.assertEqual(config.load_pav_config(cfg_path, cache_path).umask, '0077')
+
+            # As should changing a referenced environment variable.
+            orig_user = os.environ['USER']
+            os.environ['USER'] = 'cache_test_user'
+            try:
+                self.assertEqual(config.load_pav_config(cfg_path, cache_path).working_dir,
+                                 Path('/tmp/cache_test_user/wd'))
+            finally:
+                os.environ['USER'] = orig_user
+        finally:
+            cfg_path.unlink()
+            shutil.rmtree(cache_path.parents[1].as_posix())
+
+    def test_config_dir_dedup(self):
+        """Config directories given more than once should only be added once."""
+
+        cfg_dir = self.PAV_ROOT_DIR/'test/data/configs-rerun'
+        pav_cfg = config.make_config({
+            'config_dirs': [cfg_dir, cfg_dir/'..'/'configs-rerun'],
+            'user_config': False,
+        }, setup_working_dirs=False)
+
+        paths = [cfg['path'] for cfg in pav_cfg['configs'].values()]
+        self.assertEqual(paths.count(cfg_dir), 1)
+        self.assertFalse([warn for warn in pav_cfg['warnings'] if 'duplicate' in warn])
+
     def test_ex_path_elem(self):
         """Make sure the ex_path_elem works as expected."""
 
@@ -46,3 +111,5 @@ class PavConfigTests(PavTestCase):
                          Path('/tmp', os.environ['USER'], 'blarg'))
         self.assertEqual(elem.validate("/tmp/${NO_SUCH_VAR}/ok"),
                          Path("/tmp/${NO_SUCH_VAR}/ok"))
+        self.assertEqual(elem.validate("~/blarg"), Path.home()/'blarg')
+        self.assertEqual(elem.validate(Path("/tmp/blarg")), Path("/tmp/blarg"))
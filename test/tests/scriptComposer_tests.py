@@ -5,6 +5,9 @@ import stat
 from pavilion import scriptcomposer
 from pavilion.unittest import PavTestCase
 
+# The user's default group doesn't change while the tests run.
+DEFAULT_GID = os.getgid()
+
 
 class TestScriptWriter(PavTestCase):
 
@@ -24,7 +27,7 @@ class TestScriptWriter(PavTestCase):
 
         for gid in os.getgroups():
 
-            if gid == os.getgid():
+            if gid == DEFAULT_GID:
                 # This is the user's default.
                 continue
 